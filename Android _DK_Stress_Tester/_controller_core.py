@@ -0,0 +1,874 @@
+"""
+Shared core of the Android Bluetooth controllers
+Monitors a text file (Tera Term output) and controls Android device Bluetooth via ADB.
+The scripts in this folder only differ in what they do when keywords show up in the file.
+"""
+
+import atexit
+import subprocess
+import time
+import os
+import sys
+import ctypes
+import selectors
+import struct
+import mmap
+import queue
+import threading
+import heapq
+import itertools
+import logging
+import re
+from collections import deque
+from pathlib import Path
+
+# Number of most recent lines kept for keyword matching
+TAIL_LINES = 5
+# Keep the log file memory-mapped between polls. Windows does not allow a file
+# with an open mapping to be truncated, which would break Tera Term starting a new log
+KEEP_FILE_MAPPED = os.name != 'nt'
+# Marker echoed after each command sent to the persistent adb shell
+ADB_SENTINEL = '__END__'
+
+
+class _InotifyWatcher:
+    """Wait for changes to a single file using Linux inotify (via ctypes, no extra packages)"""
+    
+    IN_MODIFY = 0x00000002
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, file_path):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        
+        # Watch the parent directory so the file being created or replaced is also seen
+        mask = self.IN_MODIFY | self.IN_CREATE | self.IN_MOVED_TO | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(file_path.parent), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno), str(file_path.parent))
+        self.name = os.fsencode(file_path.name)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.fd, selectors.EVENT_READ)
+    
+    def wait(self, timeout):
+        """Block until the file changes or timeout seconds pass, return True if it changed"""
+        deadline = time.time() + timeout
+        while True:
+            if not self._selector.select(max(0, deadline - time.time())):
+                return False
+            if self._file_changed(os.read(self.fd, 64 * 1024)):
+                return True
+    
+    def _file_changed(self, data):
+        """Check if any of the queued events is about the watched file"""
+        offset = 0
+        while offset < len(data):
+            _, mask, _, name_len = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            if mask & self.IN_Q_OVERFLOW or name == self.name:
+                return True
+        return False
+    
+    def close(self):
+        self._selector.close()
+        os.close(self.fd)
+
+
+class _FileTailer:
+    """Follows the end of a growing file, reading only the bytes appended since the last read"""
+    
+    def __init__(self, file_path, tail_lines=TAIL_LINES):
+        """
+        Args:
+            file_path (Path): File to follow
+            tail_lines (int): Number of most recent lines to keep
+        """
+        self.file_path = file_path
+        self.fd = None
+        self.offset = 0
+        self._file_id = None  # (device, inode) of the open file
+        self.lines = deque(maxlen=tail_lines)  # raw bytes lines
+        self.watcher = None
+        self._mm = None
+        self._pending = b''
+    
+    def watch(self):
+        """Start inotify notifications for the file (Linux only, raises OSError if they are not available)"""
+        if sys.platform.startswith('linux'):
+            self.watcher = _InotifyWatcher(self.file_path)
+    
+    def wait(self, timeout):
+        """Wait until the file changes (only noticed early while watching) or the timeout expires"""
+        if self.watcher:
+            self.watcher.wait(timeout)
+        else:
+            time.sleep(timeout)
+    
+    def changed(self):
+        """Check if the file size differs from how far it has been read, or the file was replaced"""
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return self.offset != 0
+        return st.st_size != self.offset or (self.fd is not None and (st.st_dev, st.st_ino) != self._file_id)
+    
+    def read(self):
+        """Return the last lines of the file as bytes, reading only bytes appended since the last call"""
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            self.close_file()
+            return b''
+        
+        if self.fd is not None and (st.st_dev, st.st_ino) != self._file_id:
+            # File was replaced (log rotated, new log under the same name) - follow the new one
+            self.close_file()
+        if self.fd is None:
+            self._open_file()
+        
+        size = os.fstat(self.fd).st_size
+        if size < self.offset:
+            # File was truncated (e.g. new Tera Term session) - start over
+            self.close_file()
+            self._open_file()
+        elif size > self.offset:
+            # Only look at what was appended since the last poll
+            data = self._map_range(self.offset, size)
+            self.offset = size
+            # Keep a trailing partial line until the rest of it is written
+            *lines, self._pending = (self._pending + data).split(b'\n')
+            self.lines.extend(lines[-self.lines.maxlen:])
+        
+        return b'\n'.join(self.lines)
+    
+    def _map_range(self, start, end):
+        """Return bytes [start, end) of the file, remapping it if it has grown"""
+        if end <= start:
+            return b''
+        if self._mm is None or len(self._mm) < end:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm = mmap.mmap(self.fd, end, access=mmap.ACCESS_READ)
+        data = self._mm[start:end]
+        if not KEEP_FILE_MAPPED:
+            self._mm.close()
+            self._mm = None
+        return data
+    
+    def _open_file(self):
+        """Open the monitored file and seed the tail with its last lines"""
+        # Open with shared access - allows other processes to write while we read
+        self.fd = os.open(self.file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        st = os.fstat(self.fd)
+        self._file_id = (st.st_dev, st.st_ino)
+        size = st.st_size
+        self.offset = size
+        self.lines.clear()
+        if size == 0:
+            return
+        
+        # Walk back from the end of the mapping to find the last N complete lines
+        self._mm = mmap.mmap(self.fd, size, access=mmap.ACCESS_READ)
+        last_newline = self._mm.rfind(b'\n', 0, size)
+        start = last_newline
+        for _ in range(self.lines.maxlen):
+            if start <= 0:
+                break
+            start = self._mm.rfind(b'\n', 0, start)
+        if last_newline >= 0:
+            lines = self._mm[start + 1:last_newline].split(b'\n')
+            self.lines.extend(lines)
+        self._pending = self._mm[last_newline + 1:size]
+        if not KEEP_FILE_MAPPED:
+            self._mm.close()
+            self._mm = None
+    
+    def close_file(self):
+        """Close the monitored file and forget the current position"""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+            self._file_id = None
+        self.offset = 0
+        self._pending = b''
+        self.lines.clear()
+    
+    def close(self):
+        """Stop watching and close the file"""
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+        self.close_file()
+
+
+class AndroidBTBase:
+    """Tails the monitored file and talks to the device, subclasses implement the trigger logic"""
+    
+    def __init__(self, file_path, poll_interval=2, log_file=None):
+        """
+        Initialize the Android Bluetooth Controller
+        
+        Args:
+            file_path (str): Path to the text file to monitor (Tera Term output)
+            poll_interval (int): How often to check the file (seconds)
+            log_file (str): Path to the log file (optional)
+        """
+        self.file_path = Path(file_path)
+        self.poll_interval = poll_interval
+        self._tailer = _FileTailer(self.file_path)
+        self._adb = None
+        self._adb_output = None
+        self._adb_seq = 0
+        # Don't leave the adb shell behind however the script exits
+        atexit.register(self._stop_adb_shell)
+        self._scheduled = []  # heap of (due time, sequence, action)
+        self._schedule_seq = itertools.count()
+        self.logger = self._setup_logging(log_file)
+    
+    def _setup_logging(self, log_file):
+        """Setup logging to file and console"""
+        logger = logging.getLogger('AndroidBluetoothController')
+        logger.setLevel(logging.INFO)
+        
+        # Clear any existing handlers
+        logger.handlers.clear()
+        
+        # Create custom formatter with local time
+        class LocalTimeFormatter(logging.Formatter):
+            converter = time.localtime
+        
+        formatter = LocalTimeFormatter(
+            '%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        
+        # Console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+        
+        # File handler (if log file specified)
+        if log_file:
+            log_path = Path(log_file)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+            logger.info(f"Logging to file: {log_file}")
+        
+        return logger
+        
+    def check_adb_connection(self):
+        """Check if ADB device is connected"""
+        try:
+            # wait-for-device starts the server if needed and returns once a device is online
+            self.logger.info("Checking ADB server...")
+            try:
+                subprocess.run(['adb', 'wait-for-device'],
+                              capture_output=True,
+                              timeout=15)
+            except subprocess.TimeoutExpired:
+                self.logger.error("No Android device detected via ADB")
+                self.logger.error("Please ensure USB debugging is enabled and device is connected")
+                return False
+            
+            # Open the shell used for all further device commands
+            self._start_adb_shell()
+            _, model = self._adb_cmd('getprop ro.product.model')
+            self.logger.info(f"✓ Android device connected: {model.strip() or 'unknown model'}")
+            return True
+        except FileNotFoundError:
+            self.logger.error("ADB not found. Please install Android SDK Platform Tools")
+            self.logger.error("Download from: https://developer.android.com/studio/releases/platform-tools")
+            return False
+        except subprocess.TimeoutExpired:
+            self.logger.error("ADB command timed out. Try running 'adb kill-server' then 'adb start-server' manually")
+            return False
+        except Exception as e:
+            self.logger.error(f"Error checking ADB connection: {e}")
+            return False
+    
+    def _start_adb_shell(self):
+        """Start the long-lived adb shell that device commands are sent through"""
+        self._adb = subprocess.Popen(['adb', 'shell'],
+                                     stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT,
+                                     bufsize=0)
+        # Pipes can't be polled with a timeout on Windows, so a thread reads the output
+        self._adb_output = queue.Queue()
+        threading.Thread(target=self._read_adb_output,
+                         args=(self._adb, self._adb_output),
+                         daemon=True).start()
+    
+    @staticmethod
+    def _read_adb_output(adb, output):
+        """Forward adb shell output lines to the queue, None once the shell exits"""
+        for line in iter(adb.stdout.readline, b''):
+            output.put(line.decode('utf-8', errors='ignore').rstrip())
+        output.put(None)
+    
+    def _stop_adb_shell(self):
+        """Stop the persistent adb shell"""
+        if self._adb is not None:
+            try:
+                self._adb.stdin.close()
+                self._adb.terminate()
+                self._adb.wait(timeout=5)
+            except Exception:
+                pass
+            self._adb = None
+    
+    def _adb_cmd(self, cmd, timeout=5):
+        """
+        Run a shell command on the device through the persistent adb shell
+        
+        Returns:
+            tuple: (return code, output)
+        """
+        for attempt in range(2):
+            if self._adb is None or self._adb.poll() is not None:
+                self._start_adb_shell()
+            
+            # Unique end marker so output left over from a timed out command is skipped
+            self._adb_seq += 1
+            sentinel = f"{ADB_SENTINEL}{self._adb_seq}"
+            try:
+                self._adb.stdin.write(f"{cmd}; echo {sentinel} $?\n".encode())
+            except (OSError, ValueError):
+                # Broken pipe - shell died (device unplugged, adb server restarted)
+                self._stop_adb_shell()
+                continue
+            
+            output = []
+            deadline = time.time() + timeout
+            while True:
+                try:
+                    line = self._adb_output.get(timeout=max(0, deadline - time.time()))
+                except queue.Empty:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                if line is None:
+                    break
+                if line.startswith(sentinel + ' '):
+                    return int(line.split()[-1]), '\n'.join(output)
+                if line.startswith(ADB_SENTINEL):
+                    output.clear()
+                    continue
+                output.append(line)
+            
+            self.logger.warning("adb shell exited, reconnecting...")
+            self._stop_adb_shell()
+        
+        raise ConnectionError(f"adb shell not available to run '{cmd}'")
+    
+    def bluetooth_off(self):
+        """Turn off Bluetooth on Android device"""
+        try:
+            self.logger.info("Turning OFF Bluetooth...")
+            # Binder call straight to the bluetooth manager, svc starts a Java VM for every call
+            returncode, _ = self._adb_cmd('cmd bluetooth_manager disable')
+            if returncode != 0:
+                # Older Android versions don't have the bluetooth_manager shell command
+                returncode, _ = self._adb_cmd('svc bluetooth disable')
+            if returncode == 0:
+                self.logger.info("✓ Bluetooth turned OFF")
+            else:
+                self.logger.warning(f"Bluetooth disable command returned code {returncode}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error turning off Bluetooth: {e}")
+            return False
+    
+    def bluetooth_on(self):
+        """Turn on Bluetooth on Android device"""
+        try:
+            self.logger.info("Turning ON Bluetooth...")
+            # Binder call straight to the bluetooth manager, svc starts a Java VM for every call
+            returncode, _ = self._adb_cmd('cmd bluetooth_manager enable')
+            if returncode != 0:
+                # Older Android versions don't have the bluetooth_manager shell command
+                returncode, _ = self._adb_cmd('svc bluetooth enable')
+            if returncode == 0:
+                self.logger.info("✓ Bluetooth turned ON")
+            else:
+                self.logger.warning(f"Bluetooth enable command returned code {returncode}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error turning on Bluetooth: {e}")
+            return False
+    
+    def get_bluetooth_status(self):
+        """Get current Bluetooth status"""
+        try:
+            _, output = self._adb_cmd('settings get global bluetooth_on')
+            status = output.strip()
+            return status == '1'
+        except Exception as e:
+            self.logger.warning(f"Could not get Bluetooth status: {e}")
+            return None
+    
+    def read_tail(self):
+        """Return the last lines of the file as bytes, reading only bytes appended since the last call"""
+        max_retries = 3
+        retry_delay = 0.1
+        
+        for attempt in range(max_retries):
+            try:
+                return self._tailer.read()
+                    
+            except PermissionError:
+                # File might be temporarily locked by the writing process
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+                    continue
+                else:
+                    self.logger.warning(f"Permission denied reading file after {max_retries} attempts")
+                    return b''
+                    
+            except (IOError, OSError) as e:
+                # Handle other I/O errors (file being written, etc.)
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+                    continue
+                else:
+                    self.logger.error(f"I/O error reading file: {e}")
+                    return b''
+                    
+            except Exception as e:
+                self.logger.error(f"Error reading file: {e}")
+                return b''
+        
+        return b''
+    
+    @staticmethod
+    def _compile_scanner(*keywords):
+        """Compile the keywords into one case-insensitive bytes pattern with a group per keyword"""
+        return re.compile(b'|'.join(b'(' + re.escape(keyword.encode()) + b')' for keyword in keywords),
+                          re.IGNORECASE)
+    
+    def _scan_tail(self, tail):
+        """
+        Search the tail for all keywords in a single pass
+        
+        Args:
+            tail (bytes): Last lines of the file
+        
+        Returns:
+            list: First matching line for each keyword, None where it was not found
+        """
+        matches = [None] * self._scanner.groups
+        remaining = len(matches)
+        for m in self._scanner.finditer(tail):
+            index = m.lastindex - 1
+            if matches[index] is None:
+                # Only the matching line gets decoded
+                start = tail.rfind(b'\n', 0, m.start()) + 1
+                end = tail.find(b'\n', m.end())
+                if end == -1:
+                    end = len(tail)
+                matches[index] = tail[start:end].decode('utf-8', errors='ignore').strip()
+                remaining -= 1
+                if not remaining:
+                    break
+        return matches
+    
+    def _start_watching(self):
+        """Get change notifications for the file where possible, otherwise keep polling"""
+        try:
+            self._tailer.watch()
+        except (OSError, AttributeError) as e:
+            self.logger.warning(f"inotify not available, falling back to polling: {e}")
+    
+    def _schedule(self, delay, action):
+        """Run action after delay seconds without blocking the monitoring loop"""
+        heapq.heappush(self._scheduled, (time.time() + delay, next(self._schedule_seq), action))
+    
+    def _run_scheduled(self):
+        """Run all scheduled actions that are due"""
+        while self._scheduled and self._scheduled[0][0] <= time.time():
+            _, _, action = heapq.heappop(self._scheduled)
+            action()
+    
+    def _next_timeout(self):
+        """How long the loop may wait before something is due, at most poll_interval"""
+        deadlines = []
+        if self._scheduled:
+            deadlines.append(self._scheduled[0][0])
+        deadline = self._next_deadline()
+        if deadline is not None:
+            deadlines.append(deadline)
+        timeout = max(0, min(deadlines) - time.time()) if deadlines else self.poll_interval
+        
+        # Still poll while watching: inotify misses writes made from the other side of a WSL /mnt/c
+        # path or a network share (where Tera Term logs usually live), and an idle tick is only a stat()
+        return min(timeout, self.poll_interval)
+    
+    def _log_settings(self):
+        """Log the controller specific settings at startup"""
+    
+    def _initial_setup(self):
+        """Put the device in a known state before monitoring starts"""
+    
+    def _handle_tick(self, tail):
+        """
+        React to the current end of the file, called once per loop iteration
+        
+        Args:
+            tail (bytes): Last lines of the file, empty when the file did not change or could not be read
+        """
+        raise NotImplementedError
+    
+    def _next_deadline(self):
+        """Time at which _handle_tick has a timeout to check, or None if there is none"""
+        return None
+    
+    def _log_statistics(self):
+        """Log the final statistics when the controller is stopped"""
+    
+    def run(self):
+        """Main loop to monitor file and control Bluetooth"""
+        self.logger.info("=" * 60)
+        self.logger.info("Android Bluetooth Controller")
+        self.logger.info("=" * 60)
+        self.logger.info(f"Monitoring file: {self.file_path}")
+        self._log_settings()
+        self.logger.info(f"Poll interval: {self.poll_interval}s")
+        self.logger.info("=" * 60)
+        
+        # Check ADB connection
+        if not self.check_adb_connection():
+            return
+        
+        self._initial_setup()
+        
+        self.logger.info(">>> Starting monitoring loop...")
+        self.logger.info("Press Ctrl+C to stop")
+        
+        self._start_watching()
+        
+        try:
+            while True:
+                self._run_scheduled()
+                
+                # Only read and scan the file when its size changed since the last poll,
+                # an idle tick just runs the timeout checks. While a cycle step is still pending
+                # the new lines are left unread (like the sleeps used to) and get scanned once it ran.
+                tail = self.read_tail() if not self._scheduled and self._tailer.changed() else b''
+                self._handle_tick(tail)
+
+                # Wait for the file to change or until the next action or timeout is due
+                self._tailer.wait(self._next_timeout())
+                
+        except KeyboardInterrupt:
+            self.logger.info("\n>>> Stopping controller...")
+            self.logger.info("="*60)
+            self.logger.info("FINAL STATISTICS")
+            self.logger.info("="*60)
+            self._log_statistics()
+            self.logger.info("="*60)
+            self.logger.info("Goodbye!")
+        finally:
+            self._stop_adb_shell()
+            self._tailer.close()
+
+
+class TwoKeywordController(AndroidBTBase):
+    """Turns Bluetooth ON when the first keyword shows up and OFF again after the second one"""
+    
+    def __init__(self, file_path, keyword, keyword2, poll_interval=2, timer_duration=5, log_file=None):
+        """
+        Initialize the Android Bluetooth Controller
+        
+        Args:
+            file_path (str): Path to the text file to monitor (Tera Term output)
+            keyword (str): First keyword to search for (triggers BT ON)
+            keyword2 (str): Second keyword to search for (triggers timer then BT OFF)
+            poll_interval (int): How often to check the file (seconds)
+            timer_duration (int): How long to wait before turning off Bluetooth (seconds)
+            log_file (str): Path to the log file (optional)
+        """
+        super().__init__(file_path, poll_interval, log_file)
+        self.keyword = keyword.lower()
+        self.keyword2 = keyword2.lower()
+        self._scanner = self._compile_scanner(self.keyword, self.keyword2)
+        self.timer_duration = timer_duration
+        
+        self.total_cycles = 0
+        self.complete_cycles = 0
+        self.timeout_keyword2_cycles = 0
+        self.timeout_2min_keyword1_cycles = 0
+        self.cycle_in_progress = False
+        self.waiting_for_keyword2 = False
+        self.cycle_start_time = None
+        self.bt_on_time = None
+        self.timeout_1min_logged = False
+        self.timeout_2min_reached = False
+    
+    def _log_settings(self):
+        self.logger.info(f"Keyword 1 (BT ON): '{self.keyword}'")
+        self.logger.info(f"Keyword 2 (BT OFF): '{self.keyword2}'")
+        self.logger.info(f"Timer duration: {self.timer_duration}s")
+    
+    def _log_stats(self):
+        self.logger.info(f"   [Stats: Complete={self.complete_cycles}, Timeout_K2(1min)={self.timeout_keyword2_cycles}, Timeout_K1(10min)={self.timeout_2min_keyword1_cycles}, Total={self.total_cycles}]")
+    
+    def _initial_setup(self):
+        # Initial Bluetooth off
+        self.logger.info(">>> Initial setup: Ensuring Bluetooth is OFF")
+        self.bluetooth_off()
+        time.sleep(1)
+        
+        # Check if file is empty and run initialization sequence
+        if self.file_path.exists():
+            try:
+                file_size = self.file_path.stat().st_size
+                if file_size == 0:
+                    self.logger.info(">>> File is empty - Running initialization sequence")
+                    self.logger.info("Turning ON Bluetooth for 3 seconds...")
+                    self.bluetooth_on()
+                    time.sleep(3)
+                    self.logger.info("Turning OFF Bluetooth...")
+                    self.bluetooth_off()
+                    time.sleep(1)
+                    self.logger.info("✓ Initialization sequence complete")
+            except Exception as e:
+                self.logger.warning(f"Could not check file size: {e}")
+    
+    def _handle_tick(self, tail):
+        if tail:
+            # Check for both keywords
+            matching_line, matching_line2 = self._scan_tail(tail)
+            keyword_found = matching_line is not None
+            keyword2_found = matching_line2 is not None
+            
+            # Phase 1: Keyword 1 detected -> Turn ON Bluetooth
+            if keyword_found and not self.cycle_in_progress and not self.waiting_for_keyword2:
+                self.total_cycles += 1
+                self.cycle_in_progress = True
+                self.cycle_start_time = time.time()
+                self.timeout_1min_logged = False
+                self.timeout_2min_reached = False
+                
+                self.logger.info("\n" + "="*60)
+                self.logger.info(f"START OF CYCLE #{self.total_cycles}")
+                self.logger.info("="*60)
+                self.logger.info(f"Keyword 1 matched: {matching_line}")
+                
+                # Wait 5 seconds before turning ON Bluetooth
+                self.logger.info("⏱ Waiting 5 seconds before turning ON Bluetooth...")
+                self._schedule(5, self._turn_on_for_keyword2)
+            
+            # Keyword 1 detected again while waiting for Keyword 2 - cycle Bluetooth
+            elif keyword_found and self.waiting_for_keyword2:
+                self.logger.info(f"ℹ Keyword 1 detected again during wait: {matching_line}")
+                self.logger.info(f"Performing Bluetooth cycle: OFF -> wait 30s -> ON")
+                self.waiting_for_keyword2 = False
+                
+                # Turn OFF Bluetooth, wait 30 seconds, then turn it back ON
+                self.bluetooth_off()
+                self.logger.info("⏱ Waiting 30 seconds...")
+                self._schedule(2 + 30, self._turn_on_again)
+            
+            # Phase 2: Keyword 2 detected -> Start timer -> Turn OFF Bluetooth
+            elif keyword2_found and self.waiting_for_keyword2:
+                self.logger.info(f"Keyword 2 matched: {matching_line2}")
+                self.waiting_for_keyword2 = False
+                
+                # Wait timer duration before turning off
+                if self.timer_duration > 0:
+                    self.logger.info(f"⏱ Waiting {self.timer_duration} seconds before turning OFF Bluetooth...")
+                self._schedule(self.timer_duration, self._complete_cycle)
+        
+        # Check timeout while waiting for keyword 2 (always check, regardless of file content)
+        if self.waiting_for_keyword2 and self.bt_on_time:
+            elapsed = time.time() - self.bt_on_time
+            
+            # Force cycle completion at 10 minute mark (10min timeout on Keyword 1 - extended)
+            if elapsed >= 600 and not self.timeout_2min_reached:
+                self.logger.warning(f"⚠ 10MIN TIMEOUT: Extended timeout reached in Cycle #{self.total_cycles}")
+                self.logger.info(f"Proceeding to turn OFF Bluetooth...")
+                self.timeout_2min_reached = True
+                self.waiting_for_keyword2 = False
+                
+                # Turn OFF Bluetooth
+                self.bluetooth_off()
+                self.timeout_2min_keyword1_cycles += 1
+                self._schedule(2, lambda: self._end_cycle(
+                    f"✓ Cycle #{self.total_cycles} complete (10MIN TIMEOUT on Keyword 1). Resuming monitoring..."))
+            
+            # Log warning at 5 minute mark
+            elif elapsed >= 300 and not self.timeout_1min_logged and not self.timeout_2min_reached:
+                self.logger.warning(f"⚠ 5MIN WARNING: Keyword 2 not detected for 5 minutes in Cycle #{self.total_cycles}")
+                self.logger.info(f"Will continue waiting until 10 minute timeout...")
+                self.timeout_1min_logged = True
+            
+            # Turn off at 1 minute mark (Keyword 2 timeout)
+            elif elapsed >= 60 and not self.timeout_1min_logged:
+                self.logger.warning(f"⚠ TIMEOUT: Keyword 2 not detected for 1 minute in Cycle #{self.total_cycles}")
+                self.logger.info(f"Proceeding to turn OFF Bluetooth...")
+                self.timeout_1min_logged = True
+                self.waiting_for_keyword2 = False
+                
+                # Turn OFF Bluetooth
+                self.bluetooth_off()
+                self.timeout_keyword2_cycles += 1
+                self._schedule(2, lambda: self._end_cycle(
+                    f"✓ Cycle #{self.total_cycles} complete (TIMEOUT on Keyword 2). Resuming monitoring..."))
+    
+    def _next_deadline(self):
+        if not (self.waiting_for_keyword2 and self.bt_on_time):
+            return None
+        if not self.timeout_1min_logged:
+            return self.bt_on_time + 60
+        return self.bt_on_time + 600
+    
+    def _turn_on_for_keyword2(self):
+        """Turn ON Bluetooth at the start of a cycle, then wait for the second keyword"""
+        self.bluetooth_on()
+        self._schedule(2, lambda: self._resume_waiting("Bluetooth ON. Waiting for Keyword 2..."))
+    
+    def _turn_on_again(self):
+        """Turn Bluetooth back ON after cycling it while waiting for the second keyword"""
+        self.bluetooth_on()
+        self._schedule(2, lambda: self._resume_waiting("Bluetooth cycled. Continuing to wait for Keyword 2..."))
+    
+    def _resume_waiting(self, message):
+        """Start (or restart) the Keyword 2 timeout once Bluetooth settled ON"""
+        self.waiting_for_keyword2 = True
+        self.bt_on_time = time.time()
+        self.logger.info(message)
+    
+    def _complete_cycle(self):
+        """Turn OFF Bluetooth after Keyword 2 was found"""
+        self.bluetooth_off()
+        self.complete_cycles += 1
+        self._schedule(2, lambda: self._end_cycle(
+            f"✓ Cycle #{self.total_cycles} COMPLETE. Resuming monitoring..."))
+    
+    def _end_cycle(self, message):
+        """Close the current cycle once Bluetooth settled OFF"""
+        self.logger.info(message)
+        self._log_stats()
+        self.cycle_in_progress = False
+    
+    def _log_statistics(self):
+        self.logger.info(f"Total cycles started: {self.total_cycles}")
+        self.logger.info(f"Complete cycles (both keywords found): {self.complete_cycles}")
+        self.logger.info(f"Timeout on Keyword 2 (1 min): {self.timeout_keyword2_cycles}")
+        self.logger.info(f"10min Timeout on Keyword 1: {self.timeout_2min_keyword1_cycles}")
+        self.logger.info(f"Success rate: {(self.complete_cycles/self.total_cycles*100) if self.total_cycles > 0 else 0:.1f}%")
+
+
+class SingleKeywordController(AndroidBTBase):
+    """Keeps Bluetooth ON and starts the BLE connect service every time the keyword shows up"""
+    
+    def __init__(self, file_path, keyword, poll_interval=2, log_file=None):
+        """
+        Initialize the Android Bluetooth Controller
+        
+        Args:
+            file_path (str): Path to the text file to monitor (Tera Term output)
+            keyword (str): First keyword to search for (starts the BLE connect service)
+            poll_interval (int): How often to check the file (seconds)
+            log_file (str): Path to the log file (optional)
+        """
+        super().__init__(file_path, poll_interval, log_file)
+        self.keyword = keyword.lower()
+        self._scanner = self._compile_scanner(self.keyword)
+        
+        self.total_cycles = 0
+        self.last_trigger_line = None
+        self.last_keyword_time = time.time()
+    
+    def start_connecting(self):
+        """Start BLE connect service on Android device"""
+        try:
+            self.logger.info("Starting BLE connect service...")
+            returncode, _ = self._adb_cmd('am startservice'
+                                          ' -a com.example.bletestapp.CONNECT_PERIPHERAL'
+                                          ' --es irk 42366578927e0ecdab9cfac1f77400e5')
+            if returncode == 0:
+                self.logger.info("✓ BLE connect service started")
+                return True
+            else:
+                self.logger.warning(f"BLE connect service command returned code {returncode}")
+                return False
+        except Exception as e:
+            self.logger.error(f"Error starting BLE connect service: {e}")
+            return False
+    
+    def _log_settings(self):
+        self.logger.info(f"Keyword 1 (start connect): '{self.keyword}'")
+    
+    def _initial_setup(self):
+        # Initial Bluetooth on
+        self.logger.info(">>> Initial setup: Turning Bluetooth ON")
+        self.bluetooth_on()
+        time.sleep(1)
+
+        # Check if file is empty and run initialization sequence
+        if self.file_path.exists():
+            try:
+                file_size = self.file_path.stat().st_size
+                if file_size == 0:
+                    self.logger.info(">>> File is empty - Running initialization sequence")
+                    self.logger.info("Starting connect service for 3 seconds...")
+                    self.start_connecting()
+                    time.sleep(3)
+                    self.logger.info("✓ Initialization sequence complete")
+            except Exception as e:
+                self.logger.warning(f"Could not check file size: {e}")
+        
+        self.last_keyword_time = time.time()
+    
+    def _handle_tick(self, tail):
+        if tail:
+            # Check for first keyword
+            matching_line, = self._scan_tail(tail)
+            keyword_found = matching_line is not None
+            # Keyword 1 detected -> Start BLE connect service
+            if keyword_found and matching_line != self.last_trigger_line:
+                self.total_cycles += 1
+                self.last_trigger_line = matching_line
+                self.last_keyword_time = time.time()
+                
+                self.logger.info("\n" + "="*60)
+                self.logger.info(f"START OF CYCLE #{self.total_cycles}")
+                self.logger.info("="*60)
+                self.logger.info(f"Keyword 1 matched: {matching_line}")
+                
+                # Wait 5 seconds before starting a new connection
+                self.logger.info("⏱ Waiting 5 seconds before starting a new connection...")
+                self._schedule(5, self.start_connecting)
+
+        # Timeout: no keyword for 10 minutes -> start connect service anyway
+        if time.time() - self.last_keyword_time >= 600:
+            self.total_cycles += 1
+            self.last_keyword_time = time.time()
+            self.logger.info("\n" + "="*60)
+            self.logger.info(f"START OF CYCLE #{self.total_cycles}")
+            self.logger.info("="*60)
+            self.logger.warning("⚠ 10MIN TIMEOUT: No keyword detected. Starting connect service anyway.")
+            self.logger.info("⏱ Waiting 5 seconds before starting a new connection...")
+            self._schedule(5, self.start_connecting)
+    
+    def _next_deadline(self):
+        return self.last_keyword_time + 600
+    
+    def _log_statistics(self):
+        self.logger.info(f"Total cycles started: {self.total_cycles}")
@@ -1,6 +1,9 @@
 import os
 import re
 import csv
+import mmap
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 
 #define constant states of owner swap sequence
 STATE_WAITING_FOR_OWNER_PAIRING = 0
@@ -21,133 +24,163 @@ EVENT_BOND_DELETION = 3
 EVENT_BOND_DELETION_FAILED = 4
 EVENT_NEW_OWNER_DISCONNECTED = 5
 
+# fixed strings that mark the events in the log
+K_PS = b"Owner Pairing Started"
+K_PC = b"Owner Pairing Complete!"
+K_LT0 = b"Link Terminated Received, link 0x00"
+K_BD = b"BLE Cloud Event: Bond Deletion - Deletion Type: 02 | Status:"
+K_BD_OK = K_BD + b" 00"
+K_LT1 = b"Link Terminated Received, link 0x01"
+
+# all event strings in one pattern, the group that matched tells which event it was.
+# Bond deletion with status 00 has to come before the failed one since that also matches it
+_EVENT_RE = re.compile(b'|'.join(
+    b'(?P<' + name + b'>' + re.escape(marker) + b')'
+    for name, marker in ((b'ps', K_PS), (b'pc', K_PC), (b'lt0', K_LT0),
+                         (b'bd_ok', K_BD_OK), (b'bd_fail', K_BD), (b'lt1', K_LT1))
+))
+_EVENT_MAP = {
+    'ps': EVENT_OWNER_PAIRING_STARTED,
+    'pc': EVENT_OWNER_PAIRING_COMPLETED,
+    'lt0': EVENT_OLD_OWNER_DISCONNECTED,
+    'bd_ok': EVENT_BOND_DELETION,
+    'bd_fail': EVENT_BOND_DELETION_FAILED,
+    'lt1': EVENT_NEW_OWNER_DISCONNECTED,
+}
+
 
 # search for all .log files in the current directory and its subdirectories
 def find_log_files(directory: str):
-    log_files = []
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.log'):
-                log_files.append(os.path.join(root, file))
-    return log_files
+    """Yields (path, file name) one by one, scandir entries already know their type so no extra stat is needed"""
+    stack = [directory]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # skip directories that can't be read, like os.walk does
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.log') and entry.is_file():
+                    yield entry.path, entry.name
+
+# owner swap state machine transitions: state -> {event: (new_state, status_message)}
+_TRANSITIONS = {
+    STATE_WAITING_FOR_OWNER_PAIRING: {
+        EVENT_OWNER_PAIRING_STARTED: (STATE_OWNER_PAIRING_STARTED, "OK"),
+    },
+    STATE_OWNER_PAIRING_STARTED: {
+        EVENT_OWNER_PAIRING_COMPLETED: (STATE_OWNER_PAIRING_COMPLETED, "OK"),
+    },
+    STATE_OWNER_PAIRING_COMPLETED: {
+        EVENT_OWNER_PAIRING_STARTED: (STATE_OWNER_SWAP_INITIATED, "OK"),
+    },
+    STATE_OWNER_SWAP_INITIATED: {
+        EVENT_OLD_OWNER_DISCONNECTED: (STATE_OLD_OWNER_DISCONNECTED, "OK"),
+    },
+    STATE_OLD_OWNER_DISCONNECTED: {
+        EVENT_OWNER_PAIRING_COMPLETED: (STATE_OWNER_SWAP_COMPLETED, "OK"),
+    },
+    STATE_OWNER_SWAP_COMPLETED: {
+        EVENT_BOND_DELETION: (STATE_BOND_DELETED_STILL_CONNECTED, "OK"),
+        EVENT_BOND_DELETION_FAILED: (STATE_OWNER_SWAP_COMPLETED, "Bond Deletion failed"),
+        EVENT_NEW_OWNER_DISCONNECTED: (STATE_NEW_OWNER_DISCONNECTED_BOND_STILL_EXIST, "OK"),
+    },
+    STATE_BOND_DELETED_STILL_CONNECTED: {
+        EVENT_NEW_OWNER_DISCONNECTED: (STATE_OWNER_SWAP_SUCCESS, "OK"),
+        EVENT_OLD_OWNER_DISCONNECTED: (STATE_BOND_DELETED_STILL_CONNECTED, "OK"),
+    },
+    STATE_NEW_OWNER_DISCONNECTED_BOND_STILL_EXIST: {
+        EVENT_BOND_DELETION: (STATE_OWNER_SWAP_SUCCESS, "OK"),
+        EVENT_BOND_DELETION_FAILED: (STATE_NEW_OWNER_DISCONNECTED_BOND_STILL_EXIST, "Bond Deletion failed"),
+        EVENT_OLD_OWNER_DISCONNECTED: (STATE_NEW_OWNER_DISCONNECTED_BOND_STILL_EXIST, "OK"),
+    },
+    STATE_OWNER_SWAP_SUCCESS: {},
+}
+
+# status message for events that have no transition in a state
+_DEFAULT_MESSAGES = {
+    STATE_WAITING_FOR_OWNER_PAIRING: "Owner Pairing was not started",
+    STATE_OWNER_PAIRING_STARTED: "Owner Pairing was not completed",
+    STATE_OWNER_PAIRING_COMPLETED: "Owner Swap was not initiated",
+    STATE_OWNER_SWAP_INITIATED: "Old Owner did not disconnect",
+    STATE_OLD_OWNER_DISCONNECTED: "Owner Swap was not completed",
+    STATE_OWNER_SWAP_COMPLETED: "Bond Deletion did not occur before disconnecting",
+    STATE_BOND_DELETED_STILL_CONNECTED: "New Owner did not disconnect",
+    STATE_NEW_OWNER_DISCONNECTED_BOND_STILL_EXIST: "Bond Deletion did no occur after disconnecting",
+    STATE_OWNER_SWAP_SUCCESS: "OK",
+}
 
 # process analyze state machine for owner swap sequence based on events
 def owner_swap_state_machine(events: int, current_state: int):
     """Returns (new_state, status_message)"""
-    
-    if current_state == STATE_WAITING_FOR_OWNER_PAIRING:
-        if events == EVENT_OWNER_PAIRING_STARTED:
-            return (STATE_OWNER_PAIRING_STARTED, "OK")
-        else:
-            return (current_state, "Owner Pairing was not started")
-    
-    elif current_state == STATE_OWNER_PAIRING_STARTED:
-        if events == EVENT_OWNER_PAIRING_COMPLETED:
-            return (STATE_OWNER_PAIRING_COMPLETED, "OK")
-        else:
-            return (current_state, "Owner Pairing was not completed")
-    
-    elif current_state == STATE_OWNER_PAIRING_COMPLETED:
-        if events == EVENT_OWNER_PAIRING_STARTED:
-            return (STATE_OWNER_SWAP_INITIATED, "OK")
-        else:
-            return (current_state, "Owner Swap was not initiated")
-    
-    elif current_state == STATE_OWNER_SWAP_INITIATED:
-        if events == EVENT_OLD_OWNER_DISCONNECTED:
-            return (STATE_OLD_OWNER_DISCONNECTED, "OK")
-        else:
-            return (current_state, "Old Owner did not disconnect")
-    
-    elif current_state == STATE_OLD_OWNER_DISCONNECTED:
-        if events == EVENT_OWNER_PAIRING_COMPLETED:
-            return (STATE_OWNER_SWAP_COMPLETED, "OK")
-        else:
-            return (current_state, "Owner Swap was not completed")
-    
-    elif current_state == STATE_OWNER_SWAP_COMPLETED:
-        if events == EVENT_BOND_DELETION:
-            return (STATE_BOND_DELETED_STILL_CONNECTED, "OK")
-        elif events == EVENT_BOND_DELETION_FAILED:
-            return (current_state, "Bond Deletion failed")
-        elif events == EVENT_NEW_OWNER_DISCONNECTED:
-            return (STATE_NEW_OWNER_DISCONNECTED_BOND_STILL_EXIST, "OK")
-        else:
-            return (current_state, "Bond Deletion did not occur before disconnecting")
-    
-    elif current_state == STATE_BOND_DELETED_STILL_CONNECTED:
-        if events == EVENT_NEW_OWNER_DISCONNECTED:
-            return (STATE_OWNER_SWAP_SUCCESS, "OK")
-        elif events == EVENT_OLD_OWNER_DISCONNECTED:
-            return (current_state, "OK")
-        else:
-            return (current_state, "New Owner did not disconnect")
-    
-    elif current_state == STATE_NEW_OWNER_DISCONNECTED_BOND_STILL_EXIST:
-        if events == EVENT_BOND_DELETION:
-            return (STATE_OWNER_SWAP_SUCCESS, "OK")
-        elif events == EVENT_BOND_DELETION_FAILED:
-            return (current_state, "Bond Deletion failed")
-        elif events == EVENT_OLD_OWNER_DISCONNECTED:
-            return (current_state, "OK")
-        else:
-            return  (current_state, "Bond Deletion did no occur after disconnecting")
-        
-    elif current_state == STATE_OWNER_SWAP_SUCCESS:
-        return (current_state, "OK")
-    
-    else:
+    transitions = _TRANSITIONS.get(current_state)
+    if transitions is None:
         return (current_state, f"Unknown state: {current_state}")
+    return transitions.get(events, (current_state, _DEFAULT_MESSAGES[current_state]))
 
 
 
-# analyze the log file for owner swap sequence
+# the state machine flattened to (state, regex group name) -> (new_state, status_message),
+# so the driver loop below needs a single lookup and no function call per event
+_STEPS = {
+    (state, group): owner_swap_state_machine(event, state)
+    for state in _TRANSITIONS
+    for group, event in _EVENT_MAP.items()
+}
 
-def analyze_log_file(file_path: str, report_file_path: str):
+
+# run the events found in the log contents through the state machine
+def _drive_state_machine(data):
+    """Returns (final_state, result)"""
     owner_swap_state = STATE_WAITING_FOR_OWNER_PAIRING
     result = "OK"  # default result in case no events are matched
+    steps = _STEPS
+
+    # The regex engine skips over the lines without events, only matches come back to Python
+    for match in _EVENT_RE.finditer(data):
+        owner_swap_state, result = steps[owner_swap_state, match.lastgroup]
+        if result != "OK":
+            # Early stop on failure
+            break
+        if owner_swap_state == STATE_OWNER_SWAP_SUCCESS:
+            # Nothing after a successful swap can change the outcome
+            break
+
+    return owner_swap_state, result
+
 
+# analyze the log file for owner swap sequence
+
+def _analyze_one(log_file: tuple):
+    """Returns the report row for one (path, file name), runs in a worker process so it must not touch the report"""
+    file_path, name = log_file
     try:
-        # Use UTF-8 with replacement to avoid crashes on bad encodings
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
-            for line in file:
-                match_found = True
-
-                if re.search(r'Owner Pairing Started', line):
-                    owner_swap_state, result = owner_swap_state_machine(EVENT_OWNER_PAIRING_STARTED, owner_swap_state)
-                elif re.search(r'Owner Pairing Complete!', line):
-                    owner_swap_state, result = owner_swap_state_machine(EVENT_OWNER_PAIRING_COMPLETED, owner_swap_state)
-                elif re.search(r'Link Terminated Received, link 0x00', line):
-                    owner_swap_state, result = owner_swap_state_machine(EVENT_OLD_OWNER_DISCONNECTED, owner_swap_state)
-                elif re.search(r'BLE Cloud Event: Bond Deletion - Deletion Type: 02 \| Status: 00', line):
-                    owner_swap_state, result = owner_swap_state_machine(EVENT_BOND_DELETION, owner_swap_state)
-                elif re.search(r'BLE Cloud Event: Bond Deletion - Deletion Type: 02 \| Status:', line):
-                    owner_swap_state, result = owner_swap_state_machine(EVENT_BOND_DELETION_FAILED, owner_swap_state)
-                elif re.search(r'Link Terminated Received, link 0x01', line):
-                    owner_swap_state, result = owner_swap_state_machine(EVENT_NEW_OWNER_DISCONNECTED, owner_swap_state)
-                else:
-                    match_found = False
-
-                if match_found:
-                    if result != "OK":
-                        # Early stop on failure
-                        break
-                    else:
-                        continue
-
-        # Write result to the central CSV in the cwd
-        with open(report_file_path, 'a', newline='', encoding='utf-8') as report_file:
-            writer = csv.writer(report_file)
-            if owner_swap_state != STATE_OWNER_SWAP_SUCCESS or result != "OK":
-                writer.writerow([os.path.basename(file_path), "FAILED", owner_swap_state, result])
-            else:
-                writer.writerow([os.path.basename(file_path), "PASSED", owner_swap_state, result])
+        # Binary mode - the events are plain ASCII, so bad encodings can't get in the way
+        with open(file_path, 'rb') as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files (and some network shares) can't be mapped, read them whole instead
+                data = file.read()
+
+        # the mapping outlives the file, unmap it as soon as the scan is done - also when it fails
+        try:
+            owner_swap_state, result = _drive_state_machine(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+        if owner_swap_state != STATE_OWNER_SWAP_SUCCESS or result != "OK":
+            return [name, "FAILED", owner_swap_state, result]
+        else:
+            return [name, "PASSED", owner_swap_state, result]
 
     except Exception as e:
         # In case of crash, still log that this file failed
-        with open(report_file_path, 'a', newline='', encoding='utf-8') as report_file:
-            writer = csv.writer(report_file)
-            writer.writerow([os.path.basename(file_path), "FAILED", "EXCEPTION", str(e)])
+        return [name, "FAILED", "EXCEPTION", str(e)]
 
         
 
@@ -155,24 +188,32 @@ def main():
     # find all log files in the current directory and its subdirectories
     log_files = find_log_files(os.getcwd())
     
-    if not log_files:
+    first_log_file = next(log_files, None)
+    if first_log_file is None:
         print("No log files found in the current directory and its subdirectories.")
         return
+    log_files = itertools.chain([first_log_file], log_files)
 
-    #if analysis_report.csv exists, delete it
+    # the report is written to a temporary file first and only replaces the previous one once it is complete
     report_file_path = os.path.join(os.getcwd(), "analysis_report.csv")
-    if os.path.exists(report_file_path):
-        os.remove(report_file_path)
-
-     # Optional: write CSV header
-    with open(report_file_path, 'w', newline='', encoding='utf-8') as report_file:
-        writer = csv.writer(report_file)
-        writer.writerow(["file", "status", "final_state", "result"])
-
-    # analyze each log file
-    for i, log_file in enumerate(log_files, start=1):
-        print(f"Analyzing {i}/{len(log_files)}: {os.path.basename(log_file)}")
-        analyze_log_file(log_file, report_file_path)
+    temp_report_file_path = report_file_path + ".tmp"
+
+    # analyze the log files in parallel, the files are independent of each other.
+    # Only this process writes to the report, rows come back in the order the files were found
+    try:
+        with ProcessPoolExecutor() as executor, \
+             open(temp_report_file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(["file", "status", "final_state", "result"])
+            for i, row in enumerate(executor.map(_analyze_one, log_files, chunksize=8), start=1):
+                print(f"Analyzed {i}: {row[0]}")
+                writer.writerow(row)
+    except BaseException:
+        # don't leave a partial report behind, the previous one stays untouched
+        if os.path.exists(temp_report_file_path):
+            os.remove(temp_report_file_path)
+        raise
+    os.replace(temp_report_file_path, report_file_path)
 
 
     print("\nOwner Swap Analysis Complete. Check analysis_report.csv for results.")
@@ -12,12 +12,27 @@ Features:
 - Thread-safe operations
 """
 
+import os
 import time
 import sys
 import threading
+import functools
 from typing import Optional, Callable, Any
 
 
+@functools.lru_cache(maxsize=64)
+def _format_seconds(seconds: int) -> str:
+    """Format whole seconds to human readable format, cached since an ETA takes few distinct values."""
+    if seconds < 60:
+        return f"{seconds}s"
+    elif seconds < 3600:
+        minutes, seconds = divmod(seconds, 60)
+        return f"{minutes}m {seconds}s"
+    else:
+        hours, seconds = divmod(seconds, 3600)
+        return f"{hours}h {seconds // 60}m"
+
+
 class ProgressBar:
     """
     A flexible progress bar implementation with multiple display options.
@@ -37,6 +52,20 @@ class ProgressBar:
                 progress.update(1)
     """
     
+    # Fixed attribute layout: no per-instance __dict__, and attribute access in update() is a slot lookup
+    __slots__ = (
+        "total", "description", "bar_length", "show_percentage", "show_count", "show_rate", "show_eta",
+        "bar_format", "empty_format", "file", "current", "start_time", "last_update_time", "lock",
+        "_is_tty", "_min_interval", "_fd", "_encoding",
+        "_prefix", "_bar_template", "_fill_width", "_empty_width", "_format", "_format_rate", "_format_rate_eta",
+        "_count", "_rate", "_eta", "_rate_time", "_rate_count", "_last_frame", "_closed",
+    )
+    
+    # Weight of the latest sample in the smoothed rate (exponential moving average)
+    RATE_SMOOTHING = 0.3
+    # Longer estimates than this (30 days) aren't shown, a stalled run has no meaningful ETA
+    MAX_ETA = 30 * 24 * 3600
+    
     def __init__(self, 
                  total: int, 
                  description: str = "Progress",
@@ -73,10 +102,24 @@ class ProgressBar:
         self.bar_format = bar_format
         self.empty_format = empty_format
         self.file = file or sys.stdout
+        self._is_tty = self._check_tty()
+        # Piped to a file or CI log: print a full line every few seconds instead of redrawing in place,
+        # and leave the writes to the stream's own buffering
+        self._min_interval = 0.1 if self._is_tty else 5.0
+        self._fd = self._direct_fd() if self._is_tty else None
+        self._encoding = getattr(self.file, "encoding", None) or "utf-8"
+        self._build_formats()
         
-        self.current = 0
-        self.start_time = time.time()
+        self.current = 0  # clamped to total, refreshed whenever the bar is drawn
+        self._count = 0  # unclamped count, only changed under the lock
+        # monotonic clock - only differences are needed and it can't jump with the wall clock
+        self.start_time = time.monotonic()
         self.last_update_time = self.start_time
+        self._rate = None  # smoothed items/sec, None until something was processed
+        self._eta = None  # formatted ETA shown, None when not shown
+        self._rate_time = None  # when rate and ETA were last computed
+        self._rate_count = 0  # count at that time
+        self._last_frame = None  # what the last frame showed, to skip redrawing an identical one
         self.lock = threading.Lock()
         self._closed = False
         
@@ -87,17 +130,38 @@ class ProgressBar:
         Args:
             n: Number of steps to advance (default: 1)
         """
+        if self._closed:
+            return
+        
         with self.lock:
-            if self._closed:
+            count = self._advance(n)
+        current_time = time.monotonic()
+        total = self.total
+        min_interval = self._min_interval
+        
+        # Throttle first: only update display if enough time has passed (reduce flickering),
+        # most calls end here after the short counting lock, without clamping or drawing
+        if current_time - self.last_update_time < min_interval and count < total:
+            return
+        
+        with self.lock:
+            # Another thread may have drawn in the meantime
+            if self._closed or (current_time - self.last_update_time < min_interval and count < total):
                 return
-                
-            self.current = min(self.current + n, self.total)
-            current_time = time.time()
-            
-            # Only update display if enough time has passed (reduce flickering)
-            if current_time - self.last_update_time >= 0.1 or self.current >= self.total:
-                self._display()
-                self.last_update_time = current_time
+            self.current = min(self._count, total)
+            self._display(current_time)
+            self.last_update_time = current_time
+    
+    def _advance(self, n: int) -> int:
+        """Add n to the count and return the new (unclamped) count, called with the lock held."""
+        if n > 0:
+            # A plain add is O(1) for any step size and can't lose a concurrent update
+            self._count += n
+        else:
+            # Going backwards (or not at all) starts from what the bar can show
+            self._count = max(min(self._count, self.total) + n, 0)
+            self.current = min(self._count, self.total)
+        return self._count
     
     def set_progress(self, value: int):
         """
@@ -111,67 +175,208 @@ class ProgressBar:
                 return
                 
             self.current = min(max(value, 0), self.total)
-            self._display()
+            self._count = self.current
+            current_time = time.monotonic()
+            # Every line counts when not redrawing in place, so those are throttled here too
+            if (not self._is_tty and current_time - self.last_update_time < self._min_interval
+                    and self.current < self.total):
+                return
+            self._display(current_time)
+            self.last_update_time = current_time
+    
+    def wrap_array(self, arr):
+        """
+        Iterate over a sequence in slices, advancing the bar once per slice instead of once per item.
+        
+        Args:
+            arr: Any sliceable sequence with a length (list, bytes, array.array, NumPy array, ...)
+        
+        Returns:
+            Generator that yields consecutive slices of about a thousandth of arr
+        """
+        block = max(1, len(arr) // 1000)
+        update = self.update
+        for start in range(0, len(arr), block):
+            chunk = arr[start:start + block]
+            yield chunk
+            update(len(chunk))
+    
+    def reset(self, total: int, description: Optional[str] = None):
+        """
+        Start over with a new total, so one progress bar can be reused instead of creating a new one.
+        
+        Args:
+            total: Total number of items to process
+            description: New description text to display (default: keep the current one)
+        """
+        with self.lock:
+            self.total = total
+            if description is not None:
+                self.description = description
+                self._build_formats()
+            
+            self.current = 0
+            self._count = 0
+            self.start_time = time.monotonic()
+            self.last_update_time = self.start_time
+            self._rate = None
+            self._eta = None
+            self._rate_time = None
+            self._rate_count = 0
+            self._last_frame = None
+            self._closed = False
+    
+    def _check_tty(self) -> bool:
+        """Whether self.file is an interactive terminal."""
+        try:
+            return self.file.isatty()
+        except (AttributeError, OSError, ValueError):
+            return False
+    
+    def _direct_fd(self) -> Optional[int]:
+        """File descriptor frames can be written to directly, None to write through self.file."""
+        try:
+            fd = self.file.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+        # The Windows console needs the wide character API sys.stdout uses, raw bytes would show up garbled
+        if os.name == "nt" and self._is_tty:
+            return None
+        return fd
+    
+    def _build_formats(self):
+        """Precompute the parts of the display that don't change between frames."""
+        # Every bar is a slice of this template: the last `filled` fill characters and the first empty ones
+        prefix = ("\r" if self._is_tty else "") + self.description + ": ["
+        bar_template = self.bar_format * self.bar_length + self.empty_format * self.bar_length
+        fill, empty = self.bar_format, self.empty_format
+        if self._fd is not None:
+            # Frames are written as bytes, so encode the constant parts once here instead of every frame
+            prefix, bar_template, fill, empty = (
+                text.encode(self._encoding, "replace") for text in (prefix, bar_template, fill, empty)
+            )
+        self._prefix = prefix
+        self._bar_template = bar_template
+        self._fill_width = len(fill)
+        self._empty_width = len(empty)
+        
+        # %-format templates for the rest of the line
+        tail = "]"
+        if self.show_percentage:
+            tail += " %(percentage)6.2f%%"
+        if self.show_count:
+            tail += " %(current)s/%(total)s"
+        rate = " | Rate: %(rate).2f items/sec" if self.show_rate else ""
+        eta = " | ETA: %(eta)s" if self.show_eta else ""
+        
+        # Rate and ETA can only be shown once something has been processed, ETA only until done
+        self._format = tail
+        self._format_rate = tail + rate
+        self._format_rate_eta = tail + rate + eta
+        if not self._is_tty:
+            self._format += "\n"
+            self._format_rate += "\n"
+            self._format_rate_eta += "\n"
     
-    def _display(self):
-        """Internal method to display the current progress."""
+    def _display(self, now: float):
+        """Internal method to display the current progress as of time.monotonic() value now."""
         if self._closed:
             return
             
         # Calculate percentage
         percentage = (self.current / self.total) * 100 if self.total > 0 else 0
-        
-        # Create progress bar
         filled_length = int(self.bar_length * self.current / self.total) if self.total > 0 else 0
-        bar = self.bar_format * filled_length + self.empty_format * (self.bar_length - filled_length)
         
-        # Build display string
-        display_parts = [f"\r{self.description}: [{bar}]"]
+        # Rate and ETA move slowly, recalculate them twice a second instead of on every frame.
+        # Once the total is reached the rate is calculated one last time and then kept, later
+        # redraws (like the one in close()) don't dilute it with the time spent since
+        if self.current >= self.total:
+            refresh_rate = self._rate_count < self.total
+        else:
+            refresh_rate = self._rate_time is None or now - self._rate_time >= 0.5
+        if refresh_rate:
+            self._update_rate(now)
         
-        if self.show_percentage:
-            display_parts.append(f" {percentage:6.2f}%")
+        # Most updates change nothing visible (same bar, same hundredth of a percent, same count,
+        # rate and ETA), skip writing those. On a terminal the final frame is always drawn.
+        frame = (
+            filled_length,
+            int(percentage * 100),
+            self.current if self.show_count else None,
+            self._rate if self.show_rate else None,
+            self._eta,
+        )
+        if frame == self._last_frame and (self.current < self.total or not self._is_tty):
+            return
+        self._last_frame = frame
         
-        if self.show_count:
-            display_parts.append(f" {self.current}/{self.total}")
+        # Create progress bar
+        empty_length = self.bar_length - filled_length
+        start = empty_length * self._fill_width
+        bar = self._bar_template[start:self.bar_length * self._fill_width + empty_length * self._empty_width]
         
-        # Calculate rate and ETA
-        elapsed_time = time.time() - self.start_time
-        if elapsed_time > 0 and self.current > 0:
-            rate = self.current / elapsed_time
+        values = {"percentage": percentage, "current": self.current, "total": self.total}
+        display_format = self._format
+        if self._rate is not None:
+            values["rate"] = self._rate
+            display_format = self._format_rate
             
-            if self.show_rate:
-                display_parts.append(f" | Rate: {rate:.2f} items/sec")
+            if self._eta is not None:
+                values["eta"] = self._eta
+                display_format = self._format_rate_eta
+        
+        # Write to output
+        if self._fd is None:
+            self.file.write(self._prefix + bar + display_format % values)
+            if self._is_tty:
+                self.file.flush()
+        else:
+            # Anything printed through the stream goes out first (nothing to do if its buffer is empty),
+            # then the frame is a single write() that skips the text layer
+            self.file.flush()
+            os.write(self._fd, self._prefix + bar + (display_format % values).encode(self._encoding, "replace"))
+    
+    def _update_rate(self, now: float):
+        """Calculate rate and ETA as of time.monotonic() value now."""
+        last_time = self.start_time if self._rate_time is None else self._rate_time
+        interval = now - last_time
+        recent_rate = max(self.current - self._rate_count, 0) / interval if interval > 0 else None
+        self._rate_time = now
+        self._rate_count = self.current
+        self._eta = None
+        
+        elapsed_time = now - self.start_time
+        if elapsed_time > 0 and self.current > 0:
+            if self.current >= self.total:
+                # The final frame shows the average over the whole run
+                self._rate = self.current / elapsed_time
+            elif self._rate is None:
+                self._rate = self.current / elapsed_time
+            elif recent_rate is not None:
+                # Follow speed changes instead of averaging since the start
+                self._rate = self.RATE_SMOOTHING * recent_rate + (1 - self.RATE_SMOOTHING) * self._rate
+            rate = self._rate
             
             if self.show_eta and self.current < self.total:
                 remaining_items = self.total - self.current
-                eta_seconds = remaining_items / rate if rate > 0 else 0
-                eta_formatted = self._format_time(eta_seconds)
-                display_parts.append(f" | ETA: {eta_formatted}")
-        
-        # Write to output
-        display_string = "".join(display_parts)
-        self.file.write(display_string)
-        self.file.flush()
+                # During a stall the smoothed rate decays towards 0 and the estimate towards infinity
+                if remaining_items < rate * self.MAX_ETA:
+                    self._eta = self._format_time(remaining_items / rate)
+        else:
+            self._rate = None
     
     def _format_time(self, seconds: float) -> str:
         """Format time in seconds to human readable format."""
-        if seconds < 60:
-            return f"{seconds:.0f}s"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            seconds = int(seconds % 60)
-            return f"{minutes}m {seconds}s"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        return _format_seconds(int(seconds))
     
     def close(self):
         """Close the progress bar and print a newline."""
         with self.lock:
             if not self._closed:
-                self._display()
-                self.file.write("\n")
+                self.current = min(self._count, self.total)
+                self._display(time.monotonic())
+                if self._is_tty:
+                    self.file.write("\n")
                 self.file.flush()
                 self._closed = True
     
@@ -193,11 +398,20 @@ class SimpleSpinner:
         spinner.start()
         # Do some work
         spinner.stop()
+        
+        # Without a background thread, the caller advances the animation
+        spinner = SimpleSpinner("Processing files...", start_thread=False)
+        spinner.start()
+        for item in items:
+            # Do some work
+            spinner.tick()
+        spinner.stop()
     """
     
     def __init__(self, description: str = "Working", 
                  spinner_chars: str = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏",
-                 file=None):
+                 file=None,
+                 start_thread: bool = True):
         """
         Initialize the spinner.
         
@@ -205,22 +419,42 @@ class SimpleSpinner:
             description: Description text to display
             spinner_chars: Characters to cycle through for animation
             file: Output stream (default: sys.stdout)
+            start_thread: Animate from a background thread, otherwise the caller calls tick()
         """
         self.description = description
         self.spinner_chars = spinner_chars
         self.file = file or sys.stdout
+        self.start_thread = start_thread
         self.current_char = 0
         self.running = False
         self.thread = None
         self.lock = threading.Lock()
+        self._last_tick = 0.0
     
     def start(self):
         """Start the spinner animation."""
         with self.lock:
             if not self.running:
                 self.running = True
-                self.thread = threading.Thread(target=self._spin, daemon=True)
-                self.thread.start()
+                self._last_tick = 0.0
+                if self.start_thread:
+                    self.thread = threading.Thread(target=self._spin, daemon=True)
+                    self.thread.start()
+    
+    def tick(self, now: Optional[float] = None):
+        """
+        Advance the animation if at least 0.1 seconds passed since the last frame.
+        
+        Args:
+            now: Current time.monotonic() value, if the caller already has it
+        """
+        if not self.running:
+            return
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_tick >= 0.1:
+            self._last_tick = now
+            self._draw_frame()
     
     def stop(self):
         """Stop the spinner animation."""
@@ -229,17 +463,22 @@ class SimpleSpinner:
                 self.running = False
                 if self.thread:
                     self.thread.join()
+                    self.thread = None
                 # Clear the spinner line
                 self.file.write(f"\r{' ' * (len(self.description) + 10)}\r")
                 self.file.flush()
     
+    def _draw_frame(self):
+        """Internal method to draw the next animation frame."""
+        char = self.spinner_chars[self.current_char % len(self.spinner_chars)]
+        self.file.write(f"\r{char} {self.description}")
+        self.file.flush()
+        self.current_char += 1
+    
     def _spin(self):
-        """Internal method to animate the spinner."""
+        """Internal method to animate the spinner from the background thread."""
         while self.running:
-            char = self.spinner_chars[self.current_char % len(self.spinner_chars)]
-            self.file.write(f"\r{char} {self.description}")
-            self.file.flush()
-            self.current_char += 1
+            self._draw_frame()
             time.sleep(0.1)
 
 
@@ -280,7 +519,15 @@ class MultiFileProgress:
             description=f"{description} - Overall",
             show_rate=False
         )
-        self.file_progress = None
+        # One bar for the current file, reset for each file instead of creating a new one every time
+        self.file_progress = ProgressBar(
+            total=1,
+            description="",
+            bar_length=30,
+            show_rate=False,
+            show_eta=False
+        )
+        self._file_active = False
     
     def start_file(self, file_path: str, total_lines: Optional[int] = None):
         """
@@ -293,13 +540,8 @@ class MultiFileProgress:
         self.current_file_name = file_path
         
         if total_lines:
-            self.file_progress = ProgressBar(
-                total=total_lines,
-                description=f"  ↳ {file_path}",
-                bar_length=30,
-                show_rate=False,
-                show_eta=False
-            )
+            self.file_progress.reset(total_lines, f"  ↳ {file_path}")
+            self._file_active = True
     
     def update_file_progress(self, current_line: int, total_lines: int):
         """
@@ -309,22 +551,23 @@ class MultiFileProgress:
             current_line: Current line being processed
             total_lines: Total lines in the file
         """
-        if self.file_progress:
+        if self._file_active:
             self.file_progress.set_progress(current_line)
     
     def complete_file(self):
         """Mark the current file as complete."""
-        if self.file_progress:
+        if self._file_active:
             self.file_progress.close()
-            self.file_progress = None
+            self._file_active = False
         
         self.current_file_index += 1
         self.overall_progress.update(1)
     
     def close(self):
         """Close all progress bars."""
-        if self.file_progress:
+        if self._file_active:
             self.file_progress.close()
+            self._file_active = False
         self.overall_progress.close()
 
 
@@ -343,19 +586,33 @@ def progress_bar(iterable, description: str = "Progress", **kwargs):
     """
     total = len(iterable) if hasattr(iterable, '__len__') else None
     if total is None:
-        # For iterables without length, use a spinner
-        spinner = SimpleSpinner(description)
+        # For iterables without length, use a spinner that advances with the items
+        spinner = SimpleSpinner(description, start_thread=False)
         spinner.start()
+        tick = spinner.tick
         try:
             for item in iterable:
                 yield item
+                tick()
         finally:
             spinner.stop()
     else:
         with ProgressBar(total=total, description=description, **kwargs) as pbar:
-            for item in iterable:
-                yield item
-                pbar.update(1)
+            update = pbar.update
+            # Report in batches of up to 64 items but at most a thousandth of the total,
+            # so short (and typically slow) iterables still move the bar on every item
+            batch_size = max(1, min(64, total // 1000))
+            pending = 0
+            try:
+                for item in iterable:
+                    yield item
+                    pending += 1
+                    if pending >= batch_size:
+                        update(pending)
+                        pending = 0
+            finally:
+                if pending:
+                    update(pending)
 
 
 def count_lines_in_file(file_path: str) -> int:
@@ -369,8 +626,17 @@ def count_lines_in_file(file_path: str) -> int:
         Number of lines in the file
     """
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return sum(1 for _ in f)
+        # Count newlines in large binary blocks, no line has to be decoded or even split out
+        lines = 0
+        last_chunk = b''
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                lines += chunk.count(b'\n')
+                last_chunk = chunk
+        # A last line without a trailing newline still counts
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            lines += 1
+        return lines
     except Exception:
         return 0
 